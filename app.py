@@ -1,60 +1,302 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
+import polars as pl
 import plotly.graph_objects as go
 
 # Page configuration
 st.set_page_config(page_title="H-1B Visa Dashboard", layout="wide")
 
-# Custom CSS for better styling
-st.markdown("""
-    <style>
-    .metric-container {
-        font-size: 18px !important;
-        padding: 0.5rem !important;
-        margin-bottom: 0.5rem !important;
-    }
-    .metric-container p {
-        font-size: 18px !important;
-        margin: 0 !important;
-        padding: 0 !important;
-    }
-    .small-header {
-        font-size: 22px !important;
-        margin-bottom: 0.5rem !important;
-    }
-    </style>
-""", unsafe_allow_html=True)
+DATA_PATH = 'employer_info.parquet'
+
+# Only these source columns are ever used by the dashboard
+COLUMN_RENAMES = {
+    "Fiscal Year": "Year",
+    "Employer (Petitioner) Name": "Employer Name",
+    "Petitioner City": "City",
+    "Petitioner State": "State",
+    "Industry (NAICS) Code": "Industry",
+    "Initial Approval": "Initial_Approval",
+    "Initial Denial": "Initial_Denial",
+    "Continuing Approval": "Continuing_Approval",
+    "Continuing Denial": "Continuing_Denial"
+}
+
+# Materialized in the file by prepare_data.py; derived on the fly when
+# reading a raw extract that has not been prepared yet
+DERIVED_RENAMES = {
+    "Total Approvals": "Total_Approvals",
+    "Total Denials": "Total_Denials",
+}
+
+def _scan_source():
+    lf = pl.scan_parquet(DATA_PATH)
+    # Source column names carry stray whitespace (e.g. "Fiscal Year   ")
+    lf = lf.rename({c: c.strip() for c in lf.collect_schema().names() if c != c.strip()})
+    names = lf.collect_schema().names()
+    renames = {**COLUMN_RENAMES, **{c: a for c, a in DERIVED_RENAMES.items() if c in names}}
+    return lf.select(list(renames)).rename(renames)
 
-# Load Data
 @st.cache_data
-def load_data():
-    df = pd.read_parquet('employer_info.parquet')
-    df.columns = df.columns.str.strip()
-    # Data Preprocessing
-    df = df.rename(columns={
-        "Fiscal Year": "Year",
-        "Employer (Petitioner) Name": "Employer Name",
-        "Petitioner City": "City",
-        "Petitioner State": "State",
-        "Industry (NAICS) Code": "Industry", 
-        "Initial Approval": "Initial_Approval", 
-        "Initial Denial": "Initial_Denial", 
-        "Continuing Approval": "Continuing_Approval", 
-        "Continuing Denial": "Continuing_Denial"
-    })
-    
-    df["Total_Approvals"] = df["Initial_Approval"] + df["Continuing_Approval"]
-    df["Total_Denials"] = df["Initial_Denial"] + df["Continuing_Denial"]
+def available_years():
+    return _scan_source().select(pl.col("Year").unique().sort()).collect()["Year"].to_list()
+
+# Load Data
+# The year filter and column projection are pushed down into the Parquet
+# reader, so only the needed columns and row groups are decoded
+@st.cache_data(show_spinner=False)
+def load_data(years_key: tuple):
+    lf = _scan_source().filter(pl.col("Year").is_in(years_key))
+
+    if "Total_Approvals" not in lf.collect_schema().names():
+        lf = lf.with_columns(
+            (pl.col("Initial_Approval") + pl.col("Continuing_Approval")).alias("Total_Approvals"),
+            (pl.col("Initial_Denial") + pl.col("Continuing_Denial")).alias("Total_Denials"),
+        )
+
+    df = (
+        lf
+        .with_columns(
+            # Convert null State & City to an empty string to avoid sorting issues
+            pl.col("State").fill_null(""),
+            pl.col("City").fill_null(""),
+            # Per-employer counts are far below the Int32 range; halving the
+            # element width halves memory traffic in every sum reduction
+            pl.col(
+                "Initial_Approval", "Initial_Denial",
+                "Continuing_Approval", "Continuing_Denial",
+                "Total_Approvals", "Total_Denials",
+            ).cast(pl.Int32),
+        )
+        # Dictionary-encode the low-cardinality string columns: group-by,
+        # is_in and unique then work on integer codes instead of full strings
+        .with_columns(pl.col("Industry", "State", "City", "Employer Name").cast(pl.Categorical))
+        # Keep each year's rows contiguous; Polars records the sortedness so
+        # the per-year group-bys take their fast path instead of hashing
+        .sort("Year")
+        .collect()
+    )
     return df
 
-df = load_data()
+# Year-over-year percentage change against the previous row, 0 when there
+# is no previous year to compare against (matches the old loop behaviour)
+def yoy_pct_change(col: str) -> pl.Expr:
+    previous = pl.col(col).shift(1)
+    return (
+        pl.when(previous > 0)
+        .then((pl.col(col) - previous) / previous * 100)
+        .otherwise(0.0)
+    )
+
+# Years down the index, one approvals column per industry grouping; both
+# industry-trend charts and the approvals table are built from this shape
+def make_yearly_pivot(df, industry_col):
+    return (
+        df
+        .group_by("Year", industry_col)
+        .agg(pl.col("Total_Approvals").sum())
+        .pivot(index="Year", on=industry_col.meta.output_name(), values="Total_Approvals")
+        .fill_null(0)
+        .sort("Year")
+    )
+
+# Year-invariant aggregations, computed once per year selection so reruns
+# hit the cache instead of re-scanning the full DataFrame
+@st.cache_data
+def compute_aggregates(years_key: tuple):
+    year_filtered_df = load_data(years_key)
+
+    yearly_totals = (
+        year_filtered_df
+        .group_by("Year")
+        .agg(pl.col("Total_Approvals").sum(), pl.col("Total_Denials").sum())
+        .sort("Year")
+        .with_columns(
+            yoy_pct_change("Total_Approvals").alias("Approvals_YoY"),
+            yoy_pct_change("Total_Denials").alias("Denials_YoY"),
+        )
+    )
+
+    # Get top 10 industries by total approvals (top_k selects without
+    # fully sorting the per-industry totals); unlike pandas groupby, Polars
+    # keeps a null group, so drop the no-industry rows before ranking or
+    # they claim a top-10 slot from a real industry
+    top_10_industries = (
+        year_filtered_df
+        .filter(pl.col("Industry").is_not_null())
+        .group_by("Industry")
+        .agg(pl.col("Total_Approvals").sum())
+        .top_k(10, by="Total_Approvals")["Industry"]
+        .to_list()
+    )
+
+    # Bucket everything outside the top 10 as "Others", grouping directly on
+    # the bucketing expression so no bucketed copy of the frame is built
+    # (fill_null sends the no-industry rows into "Others" as well)
+    industry_bucket = (
+        pl.when(pl.col("Industry").is_in(top_10_industries).fill_null(False))
+        .then(pl.col("Industry").cast(pl.String))
+        .otherwise(pl.lit("Others"))
+        .alias("Industry_Category")
+    )
+
+    # Create pivot table with top 10 industries and Others
+    industry_yearly = make_yearly_pivot(year_filtered_df, industry_bucket)
+
+    # Sort the columns based on the first year's values (highest to lowest)
+    first_year_values = industry_yearly.row(0, named=True)
+    sorted_columns = sorted(
+        (c for c in industry_yearly.columns if c != "Year"),
+        key=lambda c: first_year_values[c],
+        reverse=True
+    )
+    industry_yearly = industry_yearly.select(["Year"] + sorted_columns)
+
+    # Filter for target industries
+    supply_chain_df = year_filtered_df.filter(pl.col("Industry").is_in(target_industries))
+
+    # Total approvals by supply chain industry
+    industry_approvals = (
+        supply_chain_df
+        .group_by("Industry")
+        .agg(pl.col("Total_Approvals").sum())
+        .sort("Total_Approvals")
+    )
+
+    supply_chain_yearly = make_yearly_pivot(supply_chain_df, pl.col("Industry"))
+
+    # Per-industry employer totals for the top-companies tabs: one two-key
+    # group-by instead of a separate scan per tab
+    companies_by_industry = (
+        supply_chain_df
+        .group_by("Industry", "Employer Name")
+        .agg(pl.col("Total_Approvals").sum())
+        .sort("Total_Approvals", descending=True)
+    )
+
+    # Sorted filter choices for the raw-data panel, computed once here
+    # instead of re-uniquing and re-sorting on every widget change
+    state_choices = supply_chain_df["State"].unique().cast(pl.String).sort().to_list()
+    city_choices = supply_chain_df["City"].unique().cast(pl.String).sort().to_list()
+    industry_choices = supply_chain_df["Industry"].unique().cast(pl.String).sort().to_list()
+
+    return {
+        "yearly_totals": yearly_totals,
+        "top_10_industries": top_10_industries,
+        "industry_yearly": industry_yearly,
+        "supply_chain_df": supply_chain_df,
+        "industry_approvals": industry_approvals,
+        "supply_chain_yearly": supply_chain_yearly,
+        "companies_by_industry": companies_by_industry,
+        "state_choices": state_choices,
+        "city_choices": city_choices,
+        "industry_choices": industry_choices,
+    }
+
+# Figure builders, cached on the year selection so an unchanged selection
+# reuses the already-built figure instead of reconstructing it per rerun
+@st.cache_data
+def build_trend_fig(years_key: tuple) -> go.Figure:
+    yearly_totals = compute_aggregates(years_key)["yearly_totals"]
+    fig_trend = go.Figure()
+    fig_trend.add_trace(go.Bar(
+        x=yearly_totals["Year"].to_numpy(),
+        y=yearly_totals["Total_Approvals"].to_numpy(),
+        name="Approvals",
+        marker_color='rgb(26, 118, 255)'
+    ))
+    fig_trend.add_trace(go.Bar(
+        x=yearly_totals["Year"].to_numpy(),
+        y=yearly_totals["Total_Denials"].to_numpy(),
+        name="Denials",
+        marker_color='rgb(255, 79, 79)'
+    ))
+    fig_trend.update_layout(
+        title="Overall Approvals and Denials Trend",
+        barmode='group',
+        xaxis_title="Year",
+        yaxis_title="Number of Cases",
+        height=500
+    )
+    return fig_trend
+
+# One Scattergl trace per pivot column: WebGL rendering keeps the browser
+# responsive as trace count x point count grows, and skips the long-format
+# intermediate frame px.line would build
+def add_yearly_line_traces(fig, yearly_pivot):
+    years = yearly_pivot["Year"].to_numpy()
+    for col in yearly_pivot.columns:
+        if col == "Year":
+            continue
+        fig.add_trace(go.Scattergl(
+            x=years,
+            y=yearly_pivot[col].to_numpy(),
+            name=col,
+            mode='lines+markers',
+            # Make "Others" dashed and grey
+            line=dict(dash='dash', color='grey') if col == "Others" else None,
+        ))
+
+# Shared shell for the two industry-trend charts: trace per pivot column
+# plus the common layout (whole-year ticks, unified hover)
+def build_yearly_line_fig(yearly_pivot, title, height):
+    fig = go.Figure()
+    add_yearly_line_traces(fig, yearly_pivot)
+    fig.update_layout(
+        title=title,
+        yaxis_title="Total Approvals",
+        hovermode='x unified',
+        height=height,
+        xaxis=dict(
+            tickmode='array',
+            ticktext=[str(int(year)) for year in yearly_pivot["Year"]],
+            tickvals=yearly_pivot["Year"].to_numpy(),
+            dtick=1,  # Force 1-year intervals
+            tickformat="d"  # Display as integers
+        )
+    )
+    return fig
+
+@st.cache_data
+def build_top_industries_fig(years_key: tuple) -> go.Figure:
+    industry_yearly = compute_aggregates(years_key)["industry_yearly"]
+
+    # Line chart with sorted industries
+    fig = build_yearly_line_fig(industry_yearly, "Industry Trends Over Time (Top 10 Industries)", height=600)
+
+    # Extra room on the right for the long industry names in the legend
+    fig.update_layout(
+        legend=dict(
+            orientation="v",
+            yanchor="top",
+            y=1,
+            xanchor="left",
+            x=1.02
+        ),
+        showlegend=True,
+        margin=dict(r=200)
+    )
+
+    return fig
 
-# Calculate YoY changes
-def calculate_yoy_change(current_year, previous_year):
-    if previous_year == 0:
-        return 0
-    return ((current_year - previous_year) / previous_year) * 100
+@st.cache_data
+def build_supply_chain_bar_fig(years_key: tuple) -> go.Figure:
+    industry_approvals = compute_aggregates(years_key)["industry_approvals"]
+    fig = go.Figure(go.Bar(
+        x=industry_approvals["Total_Approvals"].to_numpy(),
+        y=industry_approvals["Industry"].cast(pl.String).to_list(),
+        orientation='h'
+    ))
+    fig.update_layout(
+        title="Total Approvals by Supply Chain Industry",
+        xaxis_title="Total Approvals",
+        yaxis_title="Industry",
+        height=400
+    )
+    return fig
+
+@st.cache_data
+def build_supply_chain_trend_fig(years_key: tuple) -> go.Figure:
+    supply_chain_yearly = compute_aggregates(years_key)["supply_chain_yearly"]
+    return build_yearly_line_fig(supply_chain_yearly, "Supply Chain Industry Trends Over Time", height=500)
 
 # Main title
 st.title("🎯 H-1B Visa Analytics Dashboard")
@@ -71,88 +313,55 @@ target_industries = [
 # Sidebar for year selection only
 with st.sidebar:
     st.header("Filters")
-    years = sorted(df["Year"].unique())
+    years = available_years()
     selected_years = st.multiselect("Select Years", years, default=years)
 
-# Filter data by years
-year_filtered_df = df[df["Year"].isin(selected_years)]
+# All year-dependent aggregations come from the cache
+years_key = tuple(sorted(selected_years))
+aggs = compute_aggregates(years_key)
+yearly_totals = aggs["yearly_totals"]
 
 # KPI Metrics Section - Overall Totals
 st.header("📊 Key Metrics")
 col1, col2 = st.columns(2)
 
-# Calculate total approvals and YoY changes for all industries
-yearly_approvals = year_filtered_df.groupby("Year")["Total_Approvals"].sum()
-yearly_denials = year_filtered_df.groupby("Year")["Total_Denials"].sum()
-
-with col1:
-    st.markdown('<p class="small-header">Total Approvals by Year (with YoY changes)</p>', unsafe_allow_html=True)
-    for year in selected_years:
-        current_approvals = yearly_approvals.get(year, 0)
-        previous_approvals = yearly_approvals.get(year-1, 0) if year-1 in yearly_approvals.index else 0
-        yoy_change = calculate_yoy_change(current_approvals, previous_approvals)
-        
-        metric_text = f"{year}: {current_approvals:,.0f}"
+# The KPI blocks are the only styled HTML, so the styles live inline here
+# instead of in a page-wide <style> injection re-shipped on every rerun
+SMALL_HEADER_STYLE = "font-size: 22px; margin-bottom: 0.5rem;"
+METRIC_STYLE = "font-size: 18px; margin: 0 0 0.5rem 0; padding: 0.5rem;"
+
+# Render each metric column as a single HTML block (one st.markdown call
+# instead of one per year)
+def render_yearly_metrics(header, rows):
+    metric_texts = []
+    for year, total, yoy_change in rows:
+        metric_text = f"{year}: {total:,.0f}"
         if yoy_change != 0:
             metric_text += f" ({yoy_change:+.1f}% YoY)"
-        st.markdown(f'<div class="metric-container"><p>{metric_text}</p></div>', unsafe_allow_html=True)
+        metric_texts.append(metric_text)
 
-with col2:
-    st.markdown('<p class="small-header">Total Denials by Year (with YoY changes)</p>', unsafe_allow_html=True)
-    for year in selected_years:
-        current_denials = yearly_denials.get(year, 0)
-        previous_denials = yearly_denials.get(year-1, 0) if year-1 in yearly_denials.index else 0
-        yoy_change = calculate_yoy_change(current_denials, previous_denials)
-        
-        metric_text = f"{year}: {current_denials:,.0f}"
-        if yoy_change != 0:
-            metric_text += f" ({yoy_change:+.1f}% YoY)"
-        st.markdown(f'<div class="metric-container"><p>{metric_text}</p></div>', unsafe_allow_html=True)
-
-# Overall Trend Chart
-fig_trend = go.Figure()
-fig_trend.add_trace(go.Bar(
-    x=yearly_approvals.index,
-    y=yearly_approvals.values,
-    name="Approvals",
-    marker_color='rgb(26, 118, 255)'
-))
-fig_trend.add_trace(go.Bar(
-    x=yearly_denials.index,
-    y=yearly_denials.values,
-    name="Denials",
-    marker_color='rgb(255, 79, 79)'
-))
-fig_trend.update_layout(
-    title="Overall Approvals and Denials Trend",
-    barmode='group',
-    xaxis_title="Year",
-    yaxis_title="Number of Cases",
-    height=500
-)
-st.plotly_chart(fig_trend, use_container_width=True)
+    html = f'<p style="{SMALL_HEADER_STYLE}">{header}</p>' + "".join(
+        f'<p style="{METRIC_STYLE}">{text}</p>' for text in metric_texts
+    )
+    st.markdown(html, unsafe_allow_html=True)
 
-# Get top 10 industries by total approvals
-top_10_industries = year_filtered_df.groupby('Industry')['Total_Approvals'].sum().nlargest(10).index
+with col1:
+    render_yearly_metrics(
+        "Total Approvals by Year (with YoY changes)",
+        yearly_totals.select("Year", "Total_Approvals", "Approvals_YoY").iter_rows()
+    )
 
-# Create a copy of the dataframe and modify industry column for non-top-10
-df_for_trend = year_filtered_df.copy()
-df_for_trend['Industry_Category'] = df_for_trend['Industry'].apply(
-    lambda x: x if x in top_10_industries else 'Others'
-)
+with col2:
+    render_yearly_metrics(
+        "Total Denials by Year (with YoY changes)",
+        yearly_totals.select("Year", "Total_Denials", "Denials_YoY").iter_rows()
+    )
 
-# Create pivot table with top 10 industries and Others
-industry_yearly = df_for_trend.pivot_table(
-    values="Total_Approvals",
-    index="Year",
-    columns="Industry_Category",
-    aggfunc="sum"
-).fillna(0)
+# Overall Trend Chart
+st.plotly_chart(build_trend_fig(years_key), use_container_width=True)
 
-# Sort the columns based on the first year's values (highest to lowest)
-first_year = industry_yearly.index[0]
-sorted_columns = industry_yearly.loc[first_year].sort_values(ascending=False).index
-industry_yearly = industry_yearly[sorted_columns]
+# Convert to pandas only at the display boundary (pivots are a few rows)
+industry_yearly = aggs["industry_yearly"].to_pandas().set_index("Year")
 
 # Display the sorted data table first
 st.subheader("Industry Approval Numbers by Year")
@@ -161,151 +370,111 @@ st.dataframe(
     use_container_width=True
 )
 
-# Create line chart with sorted industries
-fig_industry_trend = px.line(
-    industry_yearly,
-    title="Industry Trends Over Time (Top 10 Industries)",
-    labels={"value": "Total Approvals", "Industry_Category": "Industry"},
-    width=1200
-)
-
-# Update layout for better readability
-fig_industry_trend.update_layout(
-    height=600,
-    xaxis=dict(
-        tickmode='array',
-        ticktext=[str(int(year)) for year in industry_yearly.index],
-        tickvals=industry_yearly.index,
-        dtick=1,
-        tickformat="d"
-    ),
-    legend=dict(
-        orientation="v",
-        yanchor="top",
-        y=1,
-        xanchor="left",
-        x=1.02
-    ),
-    showlegend=True,
-    margin=dict(r=200)  # Add right margin for legend
-)
-
-# Update line styles - make "Others" dashed and grey
-for trace in fig_industry_trend.data:
-    if trace.name == "Others":
-        trace.line.dash = 'dash'
-        trace.line.color = 'grey'
-
-st.plotly_chart(fig_industry_trend, use_container_width=True)
+# Line chart with sorted industries
+st.plotly_chart(build_top_industries_fig(years_key), use_container_width=True)
 
 # Supply Chain Industry Analysis
 st.header("🏢 Supply Chain Industry Analysis")
 
-# Filter for target industries
-supply_chain_df = year_filtered_df[year_filtered_df["Industry"].isin(target_industries)]
+supply_chain_df = aggs["supply_chain_df"]
 
 # Total approvals by supply chain industry
-industry_approvals = supply_chain_df.groupby("Industry")["Total_Approvals"].sum().sort_values(ascending=True)
-fig_industry = px.bar(
-    industry_approvals,
-    orientation='h',
-    title="Total Approvals by Supply Chain Industry",
-    labels={"value": "Total Approvals", "Industry": "Industry"}
-)
-fig_industry.update_layout(height=400)
-st.plotly_chart(fig_industry, use_container_width=True)
+st.plotly_chart(build_supply_chain_bar_fig(years_key), use_container_width=True)
 
 # Industry trends over time
-# Industry trends over time
-industry_yearly = supply_chain_df.pivot_table(
-    values="Total_Approvals",
-    index="Year",
-    columns="Industry",
-    aggfunc="sum"
-).fillna(0)
-
-fig_industry_trend = px.line(
-    industry_yearly,
-    title="Supply Chain Industry Trends Over Time",
-    labels={"value": "Total Approvals", "variable": "Industry"}
-)
-
-# Update x-axis settings to show only whole years
-fig_industry_trend.update_layout(
-    height=500,
-    xaxis=dict(
-        tickmode='array',
-        ticktext=[str(int(year)) for year in industry_yearly.index],
-        tickvals=industry_yearly.index,
-        dtick=1,  # Force 1-year intervals
-        tickformat="d"  # Display as integers
-    )
-)
-
-st.plotly_chart(fig_industry_trend, use_container_width=True)
+st.plotly_chart(build_supply_chain_trend_fig(years_key), use_container_width=True)
 
 # Top Companies Section
 st.header("🏆 Top Companies by Supply Chain Industry")
 
+# Each tab's chart is its own fragment, so reruns triggered from inside a
+# tab redraw just that chart rather than the whole script
+@st.fragment
+def render_industry_tab(industry, companies_by_industry):
+    # Already summed and sorted descending in the cached aggregation
+    top_companies = companies_by_industry.filter(pl.col("Industry") == industry).head(30)
+
+    fig_companies = go.Figure(go.Bar(
+        x=top_companies["Employer Name"].cast(pl.String).to_list(),
+        y=top_companies["Total_Approvals"].to_numpy()
+    ))
+    fig_companies.update_layout(
+        title=f"Top 30 Companies in {industry}",
+        xaxis_title="Company",
+        yaxis_title="Total Approvals",
+        height=500
+    )
+    st.plotly_chart(fig_companies, use_container_width=True)
+
 # Create tabs for each target industry
 tabs = st.tabs(target_industries)
+companies_by_industry = aggs["companies_by_industry"]
 
 for tab, industry in zip(tabs, target_industries):
     with tab:
-        industry_companies = supply_chain_df[supply_chain_df["Industry"] == industry]
-        top_companies = industry_companies.groupby("Employer Name")["Total_Approvals"].sum().nlargest(30)
-        
-        fig_companies = px.bar(
-            top_companies,
-            title=f"Top 30 Companies in {industry}",
-            labels={"value": "Total Approvals", "Employer Name": "Company"}
-        )
-        fig_companies.update_layout(height=500)
-        st.plotly_chart(fig_companies, use_container_width=True)
+        render_industry_tab(industry, companies_by_industry)
 
 # Optional: Raw Data Section with expander
-# Initialize session state for reset
-# Convert NaN (None) to an empty string for State & City to avoid sorting issues
-supply_chain_df["State"] = supply_chain_df["State"].fillna("").astype(str)
-supply_chain_df["City"] = supply_chain_df["City"].fillna("").astype(str)
-
-# Initialize session state for reset
-if "reset" not in st.session_state:
-    st.session_state.reset = False
-
-with st.expander("Show Raw Data"):
-    # Reset button
-    if st.button("Reset Filters"):
-        st.session_state.reset = True
-    else:
+# The grid cannot usefully render more rows than this, and capping keeps
+# the Arrow payload shipped to the browser bounded
+MAX_RAW_ROWS = 10_000
+
+# A fragment so filter-widget changes rerun only this block, not the
+# whole script (parquet load, aggregations and all charts above)
+@st.fragment
+def raw_data_panel(supply_chain_df, state_choices, city_choices, industry_choices):
+    # Initialize session state for reset
+    if "reset" not in st.session_state:
         st.session_state.reset = False
 
-    # Default selections
-    default_state = "All"
-    default_city = "All"
-    default_industry = supply_chain_df["Industry"].unique().tolist()  # Ensure it's always populated
-    default_search = ""
-
-    # Filters (Ensure sorting works correctly)
-    selected_state = st.selectbox("Filter by State:", ["All"] + sorted(supply_chain_df["State"].unique(), key=str))
-    selected_city = st.selectbox("Filter by City:", ["All"] + sorted(supply_chain_df["City"].unique(), key=str))
-    selected_industry = st.multiselect("Select Industry:", supply_chain_df["Industry"].unique(), default=default_industry)
-    search_company = st.text_input("Search Employer Name:", value=default_search)
-
-    # Apply filters
-    filtered_df = supply_chain_df.copy()
-
-    if selected_state != "All":
-        filtered_df = filtered_df[filtered_df["State"] == selected_state]
-
-    if selected_city != "All":
-        filtered_df = filtered_df[filtered_df["City"] == selected_city]
-
-    if selected_industry:
-        filtered_df = filtered_df[filtered_df["Industry"].isin(selected_industry)]
-
-    if search_company:
-        filtered_df = filtered_df[filtered_df["Employer Name"].str.contains(search_company, case=False, na=False)]
-
-    # Display filtered data
-    st.dataframe(filtered_df)
\ No newline at end of file
+    with st.expander("Show Raw Data"):
+        # Reset button
+        if st.button("Reset Filters"):
+            st.session_state.reset = True
+        else:
+            st.session_state.reset = False
+
+        # Default selections
+        default_state = "All"
+        default_city = "All"
+        default_industry = industry_choices  # Ensure it's always populated
+        default_search = ""
+
+        # Filters (choice lists are precomputed and sorted in the cache)
+        selected_state = st.selectbox("Filter by State:", ["All"] + state_choices)
+        selected_city = st.selectbox("Filter by City:", ["All"] + city_choices)
+        selected_industry = st.multiselect("Select Industry:", industry_choices, default=default_industry)
+        search_company = st.text_input("Search Employer Name:", value=default_search)
+
+        # Collect the active predicates and filter in a single pass, so at
+        # most one filtered frame is materialized (and none when every
+        # filter is left at its default)
+        predicates = []
+
+        if selected_state != "All":
+            predicates.append(pl.col("State") == selected_state)
+
+        if selected_city != "All":
+            predicates.append(pl.col("City") == selected_city)
+
+        if selected_industry and len(selected_industry) < len(industry_choices):
+            predicates.append(pl.col("Industry").is_in(selected_industry))
+
+        if search_company:
+            # Case-folded literal substring match: a vectorized Arrow kernel,
+            # no regex compile per keystroke and no per-row Python strings
+            predicates.append(
+                pl.col("Employer Name").cast(pl.String)
+                .str.to_lowercase()
+                .str.contains(search_company.lower(), literal=True)
+            )
+
+        filtered_df = supply_chain_df.filter(*predicates) if predicates else supply_chain_df
+
+        # Display filtered data, handed over as an Arrow table (zero-copy
+        # from Polars, and Streamlit serializes Arrow to the browser anyway)
+        view = filtered_df.head(MAX_RAW_ROWS)
+        st.dataframe(view.to_arrow())
+        st.caption(f"Showing {view.height:,} of {filtered_df.height:,} rows")
+
+raw_data_panel(supply_chain_df, aggs["state_choices"], aggs["city_choices"], aggs["industry_choices"])